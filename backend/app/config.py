@@ -3,3 +3,4 @@ import os
 CACHE_DIR = os.environ.get("FASTF1_CACHE_DIR", "./cache")
 CORS_ORIGINS = os.environ.get("CORS_ORIGINS", "http://localhost:5173,http://localhost:3000").split(",")
 MAX_CONCURRENT_LOADS = 2
+SESSION_CACHE_SIZE = int(os.environ.get("SESSION_CACHE_SIZE", "8"))
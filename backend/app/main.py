@@ -1,11 +1,18 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .config import CORS_ORIGINS
 from .routers import races, drivers, strategy, simulate
 
-app = FastAPI(title="F1 Strategy Simulator API", version="1.0.0")
+app = FastAPI(
+    title="F1 Strategy Simulator API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
 
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=CORS_ORIGINS,
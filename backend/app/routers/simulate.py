@@ -1,3 +1,4 @@
+import numpy as np
 from fastapi import APIRouter, HTTPException
 
 from ..models.strategy import SimulateRequest
@@ -20,14 +21,22 @@ def run_simulation(req: SimulateRequest):
     laps = session.laps
     total_race_laps = int(laps["LapNumber"].max())
 
-    total_planned = sum(s.laps for s in req.stints)
+    # Single pass over the stints: total laps, compound variety, and the
+    # dict form the services consume
+    total_planned = 0
+    unique_compounds = set()
+    stints_dicts = []
+    for s in req.stints:
+        total_planned += s.laps
+        unique_compounds.add(s.compound)
+        stints_dicts.append({"compound": s.compound, "laps": s.laps})
+
     if total_planned != total_race_laps:
         raise HTTPException(
             status_code=400,
             detail=f"Total planned laps ({total_planned}) must equal race distance ({total_race_laps}).",
         )
 
-    unique_compounds = set(s.compound for s in req.stints)
     if len(unique_compounds) < 2:
         raise HTTPException(status_code=400, detail="Must use at least 2 different tire compounds.")
 
@@ -35,23 +44,24 @@ def run_simulation(req: SimulateRequest):
     pit_stats = get_pit_stop_stats(session)
     pit_loss = pit_stats["avg_pit_time"]
 
-    stints_dicts = [{"compound": s.compound, "laps": s.laps} for s in req.stints]
     sim_results = simulate_strategy(models, stints_dicts, pit_loss, total_race_laps)
 
     actual = get_driver_actual_strategy(session, req.driver)
 
-    user_total = sum(r["time_sec"] for r in sim_results)
+    user_laps = np.fromiter((r["lap"] for r in sim_results), dtype=np.int64, count=len(sim_results))
+    user_times = np.fromiter((r["time_sec"] for r in sim_results), dtype=np.float64, count=len(sim_results))
+    user_total = float(user_times.sum())
 
-    # Compute cumulative gap
+    # Compute cumulative gap on aligned lap arrays in one vectorized pass
     cumulative_gap = []
     if actual and actual["lap_times"]:
-        actual_dict = {lt["lap"]: lt["time_sec"] for lt in actual["lap_times"]}
-        user_dict = {r["lap"]: r["time_sec"] for r in sim_results}
-        common_laps = sorted(set(actual_dict.keys()) & set(user_dict.keys()))
-        running_diff = 0.0
-        for lap in common_laps:
-            running_diff += user_dict[lap] - actual_dict[lap]
-            cumulative_gap.append({"lap": lap, "gap": round(running_diff, 3)})
+        actual_laps = np.fromiter((lt["lap"] for lt in actual["lap_times"]), dtype=np.int64, count=len(actual["lap_times"]))
+        actual_times = np.fromiter((lt["time_sec"] for lt in actual["lap_times"]), dtype=np.float64, count=len(actual["lap_times"]))
+        common_laps, user_idx, actual_idx = np.intersect1d(
+            user_laps, actual_laps, assume_unique=True, return_indices=True
+        )
+        gaps = np.cumsum(user_times[user_idx] - actual_times[actual_idx]).round(3)
+        cumulative_gap = [{"lap": int(lap), "gap": float(gap)} for lap, gap in zip(common_laps, gaps)]
 
     # Per-stint analysis
     stint_analysis = analyze_stints(models, stints_dicts, actual, pit_loss, total_race_laps)
@@ -1,4 +1,7 @@
+from functools import lru_cache
+
 import fastf1
+import pandas as pd
 
 from .session_service import load_session
 
@@ -23,27 +26,44 @@ def get_races(year: int) -> list[dict]:
     return [r for r in races if r["round"] > 0]
 
 
+@lru_cache(maxsize=32)
+def _driver_codes(year: int, race: str, session_type: str) -> tuple[str, ...]:
+    """Sorted driver codes for a session, cached so repeat lookups skip the
+    unique-scan over the laps frame."""
+    session = load_session(year, race, session_type)
+    drivers = session.laps["Driver"]
+    if isinstance(drivers.dtype, pd.CategoricalDtype):
+        # Categories are already sorted and unique — no hash pass needed
+        return tuple(drivers.cat.categories)
+    return tuple(sorted(drivers.dropna().unique().tolist()))
+
+
 def get_drivers(year: int, race: str, session_type: str) -> list[dict]:
     """Get drivers for a given session, enriched with name/team from results."""
     session = load_session(year, race, session_type)
-    driver_codes = sorted(session.laps["Driver"].unique().tolist())
+    driver_codes = _driver_codes(year, race, session_type)
 
-    drivers = []
     results = session.results if hasattr(session, "results") and session.results is not None else None
 
+    # One pass over results to build a code -> (name, team) lookup instead of
+    # scanning the results frame per driver
+    by_code = {}
+    if results is not None and not results.empty:
+        by_code = (
+            results.drop_duplicates("Abbreviation")
+            .set_index("Abbreviation")[["FullName", "TeamName"]]
+            .to_dict("index")
+        )
+
+    drivers = []
     for code in driver_codes:
-        name = code
-        team = ""
-        if results is not None and not results.empty:
-            driver_row = results[results["Abbreviation"] == code]
-            if not driver_row.empty:
-                row = driver_row.iloc[0]
-                full_name = row.get("FullName", "")
-                if full_name:
-                    name = str(full_name)
-                team_name = row.get("TeamName", "")
-                if team_name:
-                    team = str(team_name)
-        drivers.append({"code": code, "name": name, "team": team})
+        row = by_code.get(code, {})
+        full_name = row.get("FullName", "")
+        team_name = row.get("TeamName", "")
+        drivers.append({
+            "code": code,
+            "name": str(full_name) if full_name else code,
+            "team": str(team_name) if team_name else "",
+        })
 
     return drivers
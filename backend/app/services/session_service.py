@@ -1,44 +1,140 @@
 import os
+import pickle
 import threading
+from collections import OrderedDict
 
 import fastf1
 
-from ..config import CACHE_DIR, MAX_CONCURRENT_LOADS
+from ..config import CACHE_DIR, MAX_CONCURRENT_LOADS, SESSION_CACHE_SIZE
 
 os.makedirs(CACHE_DIR, exist_ok=True)
 fastf1.Cache.enable_cache(CACHE_DIR)
 
-_session_cache: dict = {}
-_load_locks: dict[tuple, threading.Lock] = {}
-_locks_lock = threading.Lock()
-_semaphore = threading.Semaphore(MAX_CONCURRENT_LOADS)
+# LRU: most recently used keys live at the end; evicting from the front keeps
+# memory bounded (each loaded session holds ~500MB of timing data).
+_session_cache: OrderedDict = OrderedDict()
+_cache_lock = threading.Lock()
+# Single-flight markers: one Event per key currently being loaded, removed
+# when the load finishes so the table never grows past in-flight loads.
+_inflight: dict[tuple, threading.Event] = {}
+_inflight_lock = threading.Lock()
+_semaphore = threading.BoundedSemaphore(MAX_CONCURRENT_LOADS)
 
 
-def _get_lock(key: tuple) -> threading.Lock:
-    with _locks_lock:
-        if key not in _load_locks:
-            _load_locks[key] = threading.Lock()
-        return _load_locks[key]
+def _cache_get(key: tuple):
+    with _cache_lock:
+        session = _session_cache.get(key)
+        if session is not None:
+            _session_cache.move_to_end(key)
+        return session
+
+
+def _cache_put(key: tuple, session) -> None:
+    with _cache_lock:
+        _session_cache[key] = session
+        _session_cache.move_to_end(key)
+        while len(_session_cache) > SESSION_CACHE_SIZE:
+            _session_cache.popitem(last=False)
+
+
+def _pickle_path(key: tuple) -> str:
+    year, race, session_type = key
+    safe_race = "".join(c if c.isalnum() else "_" for c in str(race))
+    # fastf1 version in the name invalidates pickles across library upgrades
+    return os.path.join(CACHE_DIR, f"session_{year}_{safe_race}_{session_type}_{fastf1.__version__}.pkl")
+
+
+def _load_pickled(key: tuple):
+    """Second-level cache: a pickled session skips FastF1's re-parse on
+    process restart. Returns None on any failure."""
+    path = _pickle_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        print(f"Discarding unreadable session pickle {path}: {e}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+
+def _store_pickled(key: tuple, session) -> None:
+    path = _pickle_path(key)
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(session, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"Could not pickle session to {path}: {e}")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _optimize_laps(session) -> None:
+    """Cast hot string columns to categoricals so driver/compound filters and
+    groupbys compare integer codes instead of Python strings, and materialize
+    LapTime as float seconds once so downstream services don't repeat
+    .dt.total_seconds() on overlapping subsets. Idempotent, so it also runs on
+    sessions restored from older pickles."""
+    laps = getattr(session, "laps", None)
+    if laps is None or laps.empty:
+        return
+    for col in ("Compound", "Driver", "TrackStatus"):
+        if col in laps.columns:
+            laps[col] = laps[col].astype("category")
+    if "LapTime" in laps.columns and "LapTimeSec" not in laps.columns:
+        laps["LapTimeSec"] = laps["LapTime"].dt.total_seconds()
+    # Sort once so every per-driver consumer sees laps in lap order without
+    # re-sorting; mergesort keeps the order stable and deterministic.
+    # Session.laps is a read-only property, so sort the frame in place.
+    if "Driver" in laps.columns and "LapNumber" in laps.columns:
+        laps.sort_values(["Driver", "LapNumber"], kind="mergesort", inplace=True)
 
 
 def load_session(year: int, race: str, session_type: str):
-    """Load and cache a FastF1 session (thread-safe with semaphore)."""
+    """Load and cache a FastF1 session (thread-safe, single-flight per key)."""
     key = (year, race, session_type)
-    if key in _session_cache:
-        return _session_cache[key]
 
-    lock = _get_lock(key)
-    with lock:
-        # Double-check after acquiring lock
-        if key in _session_cache:
-            return _session_cache[key]
+    while True:
+        session = _cache_get(key)
+        if session is not None:
+            return session
 
-        _semaphore.acquire()
-        try:
-            session = fastf1.get_session(year, race, session_type)
-            session.load()
-            _session_cache[key] = session
-        finally:
-            _semaphore.release()
+        with _inflight_lock:
+            event = _inflight.get(key)
+            if event is None:
+                # We are the loader for this key
+                event = threading.Event()
+                _inflight[key] = event
+                break
+
+        # Another thread is loading this key — wait for it, then re-check the
+        # cache (and retry as loader if its load failed)
+        event.wait()
+
+    try:
+        with _semaphore:
+            session = _load_pickled(key)
+            if session is None:
+                session = fastf1.get_session(year, race, session_type)
+                session.load()
+                _optimize_laps(session)
+                _store_pickled(key, session)
+            else:
+                # Pickles written before the current set of laps optimizations
+                # may lack derived columns; re-applying is cheap and idempotent
+                _optimize_laps(session)
+            _cache_put(key, session)
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        event.set()
 
-    return _session_cache[key]
+    return session
@@ -1,69 +1,104 @@
+import itertools
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
 
-from .session_service import load_session
-
 # Fuel effect: approximately 0.055s per lap faster as fuel burns off
 # F1 cars start with ~110kg fuel, burn ~1.8kg/lap, ~0.03s/kg delta
 FUEL_EFFECT_PER_LAP = 0.055  # seconds gained per lap from fuel burn-off
 
 
+def _lap_time_sec(laps) -> pd.Series:
+    """LapTime as float seconds, preferring the LapTimeSec column cached by
+    session_service at load time over re-materializing from Timedelta64."""
+    if "LapTimeSec" in laps.columns:
+        return laps["LapTimeSec"]
+    return laps["LapTime"].dt.total_seconds()
+
+
+def _derived_cache(session) -> dict:
+    """Per-session cache for driver-independent derived data (degradation
+    curves, models, pit stats). Stored on the session object so it is evicted
+    together with the session."""
+    cache = getattr(session, "_derived_cache", None)
+    if cache is None:
+        cache = {}
+        session._derived_cache = cache
+    return cache
+
+
 def get_race_degradation_data(session, fuel_corrected: bool = True) -> dict:
     """Extract tire degradation curves from a race session.
     
     Uses per-stint analysis to avoid fuel load confounding the results.
     """
+    cache = _derived_cache(session)
+    cache_key = ("degradation", fuel_corrected)
+    if cache_key in cache:
+        return cache[cache_key]
+
     laps = session.laps
     degradation = {}
 
-    for compound in ["SOFT", "MEDIUM", "HARD"]:
-        try:
-            compound_laps = laps.pick_compounds(compound)
-            clean_laps = compound_laps.pick_wo_box().pick_accurate()
+    try:
+        # Cheap, selective masks first (compound and track status), then the
+        # heavier FastF1 pit/accuracy filters on the reduced frame
+        clean_laps = laps[laps["Compound"].isin(["SOFT", "MEDIUM", "HARD"])]
 
-            if "TrackStatus" in clean_laps.columns:
-                clean_laps = clean_laps[
-                    clean_laps["TrackStatus"].isin(["1", "2", 1, 2])
-                    | clean_laps["TrackStatus"].isna()
-                ]
+        if "TrackStatus" in clean_laps.columns:
+            clean_laps = clean_laps[
+                clean_laps["TrackStatus"].isin(["1", "2", 1, 2])
+                | clean_laps["TrackStatus"].isna()
+            ]
 
-            if clean_laps.empty:
-                continue
+        clean_laps = clean_laps.pick_wo_box().pick_accurate()
 
-            clean_laps = clean_laps.copy()
-            clean_laps["LapTimeSec"] = clean_laps["LapTime"].dt.total_seconds()
+        if clean_laps.empty:
+            return degradation
 
-            mean_time = clean_laps["LapTimeSec"].mean()
-            std_time = clean_laps["LapTimeSec"].std()
-            if std_time > 0:
-                clean_laps = clean_laps[
-                    (clean_laps["LapTimeSec"] >= mean_time - 2 * std_time)
-                    & (clean_laps["LapTimeSec"] <= mean_time + 2 * std_time)
-                ]
+        if "LapTimeSec" not in clean_laps.columns:
+            clean_laps = clean_laps.assign(LapTimeSec=clean_laps["LapTime"].dt.total_seconds())
 
-            if clean_laps.empty:
-                continue
+        # Per-compound outlier removal in one vectorized pass; the 5th-95th
+        # percentile window is robust to traffic/safety-car laps that would
+        # drag a mean±2σ band
+        lo = clean_laps.groupby("Compound", observed=True)["LapTimeSec"].transform("quantile", 0.05)
+        hi = clean_laps.groupby("Compound", observed=True)["LapTimeSec"].transform("quantile", 0.95)
+        clean_laps = clean_laps[clean_laps["LapTimeSec"].between(lo, hi)]
 
-            # Group by tyre life for the visualization
-            grouped = clean_laps.groupby("TyreLife")["LapTimeSec"].agg(["mean", "std", "count"])
-            grouped = grouped[grouped["count"] >= 2]
+        if clean_laps.empty:
+            return degradation
 
-            if grouped.empty:
-                grouped = clean_laps.groupby("TyreLife")["LapTimeSec"].agg(["mean", "std", "count"])
+        # Group by tyre life for the visualization — one pass for all compounds
+        grouped = clean_laps.groupby(["Compound", "TyreLife"], observed=True)["LapTimeSec"].agg(
+            ["mean", "std", "count"]
+        )
+
+        for compound in ["SOFT", "MEDIUM", "HARD"]:
+            if compound not in grouped.index.unique(level="Compound"):
+                continue
+            compound_grouped = grouped.xs(compound)
+            filtered = compound_grouped[compound_grouped["count"] >= 2]
+
+            if filtered.empty:
+                filtered = compound_grouped
 
-            if grouped.empty:
+            if filtered.empty:
                 continue
 
+            # Round to 0.1ms — full float64 repr roughly doubles the JSON width
+            # for no visible difference in the charts
             degradation[compound] = {
-                "tyre_life": grouped.index.tolist(),
-                "avg_lap_time": grouped["mean"].tolist(),
-                "std_lap_time": grouped["std"].fillna(0).tolist(),
-                "count": grouped["count"].tolist(),
+                "tyre_life": filtered.index.tolist(),
+                "avg_lap_time": filtered["mean"].round(4).tolist(),
+                "std_lap_time": filtered["std"].fillna(0).round(4).tolist(),
+                "count": filtered["count"].tolist(),
             }
-        except Exception as e:
-            print(f"Error processing compound {compound}: {e}")
-            continue
+    except Exception as e:
+        print(f"Error processing degradation data: {e}")
 
+    cache[cache_key] = degradation
     return degradation
 
 
@@ -73,55 +108,73 @@ def build_degradation_model(session) -> dict:
     This approach calculates degradation within each stint (where fuel is roughly constant),
     then averages across stints. This avoids the fuel load confounding the results.
     """
+    cache = _derived_cache(session)
+    if "models" in cache:
+        return cache["models"]
+
     laps = session.laps
     models = {}
-    
-    for compound in ["SOFT", "MEDIUM", "HARD"]:
-        try:
-            compound_laps = laps.pick_compounds(compound).pick_wo_box().pick_accurate()
-            if compound_laps.empty:
-                continue
-            
-            degradation_rates = []
-            base_times = []
-            
-            # Group by driver and stint
-            for (driver, stint), stint_laps in compound_laps.groupby(['Driver', 'Stint']):
-                stint_laps = stint_laps.sort_values('TyreLife')
-                if len(stint_laps) < 3:  # Need at least 3 laps for meaningful regression
-                    continue
-                
-                tyre_life = stint_laps['TyreLife'].values
-                lap_times = stint_laps['LapTime'].dt.total_seconds().values
-                
-                # Remove outliers
-                mean_time = np.mean(lap_times)
-                std_time = np.std(lap_times)
-                if std_time > 0:
-                    mask = np.abs(lap_times - mean_time) < 2 * std_time
-                    if mask.sum() < 3:
-                        continue
-                    tyre_life = tyre_life[mask]
-                    lap_times = lap_times[mask]
-                
-                coeffs = np.polyfit(tyre_life, lap_times, 1)
-                deg_rate = coeffs[0]  # slope
-                base_time = coeffs[1]  # intercept
-                
-                # Only include reasonable degradation rates (0 to 200ms/lap)
-                if 0 < deg_rate < 0.2:
-                    degradation_rates.append(deg_rate)
-                    base_times.append(base_time)
-            
-            if degradation_rates:
-                models[compound] = {
-                    "base_time": float(np.mean(base_times)),
-                    "deg_rate": float(np.mean(degradation_rates)),
-                }
-        except Exception as e:
-            print(f"Error building model for {compound}: {e}")
-            continue
-    
+
+    try:
+        # Clean once for all compounds, then fit every (driver, stint) group
+        # in one grouped pass: the outlier mask is a per-group z-score via
+        # transform, and the closed-form least-squares fit
+        #   slope = (n*Σxy - Σx*Σy) / (n*Σxx - (Σx)²)
+        # needs only group sums, so a single groupby-agg replaces the old
+        # per-stint Python loop.
+        clean = laps[laps["Compound"].isin(["SOFT", "MEDIUM", "HARD"])]
+        clean = clean.pick_wo_box().pick_accurate()
+
+        if not clean.empty:
+            df = pd.DataFrame({
+                "Compound": clean["Compound"].astype(str),
+                "Driver": clean["Driver"],
+                "Stint": clean["Stint"],
+                "x": clean["TyreLife"].astype(float),
+                "y": _lap_time_sec(clean),
+            })
+
+            keys = ["Compound", "Driver", "Stint"]
+            g = df.groupby(keys, observed=True)["y"]
+            # Need at least 3 laps for a meaningful regression
+            df = df[g.transform("size") >= 3]
+
+            # Per-stint 2σ outlier removal (population σ, matching the old
+            # per-group np.std); σ == 0 keeps the whole group
+            g = df.groupby(keys, observed=True)["y"]
+            mu = g.transform("mean")
+            sd = g.transform("std", ddof=0)
+            df = df[(sd == 0) | ((df["y"] - mu).abs() < 2 * sd)]
+
+            df = df.assign(xy=df["x"] * df["y"], xx=df["x"] * df["x"])
+            agg = df.groupby(keys, observed=True).agg(
+                n=("x", "size"), sx=("x", "sum"), sy=("y", "sum"),
+                sxy=("xy", "sum"), sxx=("xx", "sum"),
+            )
+            agg = agg[agg["n"] >= 3]
+
+            denom = agg["n"] * agg["sxx"] - agg["sx"] * agg["sx"]
+            agg = agg[denom != 0]
+            denom = denom[denom != 0]
+
+            slope = (agg["n"] * agg["sxy"] - agg["sx"] * agg["sy"]) / denom
+            intercept = (agg["sy"] - slope * agg["sx"]) / agg["n"]
+
+            # Only include reasonable degradation rates (0 to 200ms/lap)
+            ok = (slope > 0) & (slope < 0.2)
+            fits = pd.DataFrame({"deg_rate": slope[ok], "base_time": intercept[ok]})
+            by_compound = fits.groupby(level="Compound", observed=True).mean()
+
+            for compound in ["SOFT", "MEDIUM", "HARD"]:
+                if compound in by_compound.index:
+                    models[compound] = {
+                        "base_time": float(by_compound.loc[compound, "base_time"]),
+                        "deg_rate": float(by_compound.loc[compound, "deg_rate"]),
+                    }
+    except Exception as e:
+        print(f"Error building degradation models: {e}")
+
+
     # If we couldn't calculate models for some compounds, use reasonable defaults
     # based on typical F1 tire behavior
     default_base = 95.0
@@ -142,7 +195,8 @@ def build_degradation_model(session) -> dict:
                 models["MEDIUM"] = {"base_time": avg_base, "deg_rate": 0.045}
             if "HARD" not in models:
                 models["HARD"] = {"base_time": avg_base + 0.5, "deg_rate": 0.030}
-    
+
+    cache["models"] = models
     return models
 
 
@@ -176,13 +230,31 @@ def get_weather_data(session) -> dict:
             "conditions": "Unknown"
         }
     
-    # Get average/representative values
-    air_temp = weather["AirTemp"].mean() if "AirTemp" in weather.columns else None
-    track_temp = weather["TrackTemp"].mean() if "TrackTemp" in weather.columns else None
-    humidity = weather["Humidity"].mean() if "Humidity" in weather.columns else None
-    rainfall = bool(weather["Rainfall"].max() > 0) if "Rainfall" in weather.columns else False
-    wind_speed = weather["WindSpeed"].mean() if "WindSpeed" in weather.columns else None
-    
+    # Get average/representative values — one .agg pass over the frame
+    # instead of a separate mean/min/max scan per column
+    wanted = {
+        "AirTemp": ["mean"],
+        "TrackTemp": ["mean", "min", "max"],
+        "Humidity": ["mean"],
+        "Rainfall": ["max"],
+        "WindSpeed": ["mean"],
+    }
+    spec = {col: stats for col, stats in wanted.items() if col in weather.columns}
+    agg = weather[list(spec)].agg(spec) if spec else None
+
+    def _stat(col: str, stat: str):
+        if agg is None or col not in agg.columns:
+            return None
+        value = agg.loc[stat, col]
+        return None if pd.isna(value) else float(value)
+
+    air_temp = _stat("AirTemp", "mean")
+    track_temp = _stat("TrackTemp", "mean")
+    humidity = _stat("Humidity", "mean")
+    rain_max = _stat("Rainfall", "max")
+    rainfall = bool(rain_max is not None and rain_max > 0)
+    wind_speed = _stat("WindSpeed", "mean")
+
     # Determine conditions description
     if rainfall:
         conditions = "Wet"
@@ -193,113 +265,111 @@ def get_weather_data(session) -> dict:
     else:
         conditions = "Dry"
     
+    track_temp_min = _stat("TrackTemp", "min")
+    track_temp_max = _stat("TrackTemp", "max")
     return {
         "available": True,
-        "air_temp": round(float(air_temp), 1) if air_temp else None,
-        "track_temp": round(float(track_temp), 1) if track_temp else None,
-        "humidity": round(float(humidity), 1) if humidity else None,
+        "air_temp": round(air_temp, 1) if air_temp else None,
+        "track_temp": round(track_temp, 1) if track_temp else None,
+        "humidity": round(humidity, 1) if humidity else None,
         "rainfall": rainfall,
-        "wind_speed": round(float(wind_speed), 1) if wind_speed else None,
+        "wind_speed": round(wind_speed, 1) if wind_speed else None,
         "conditions": conditions,
-        "track_temp_min": round(float(weather["TrackTemp"].min()), 1) if "TrackTemp" in weather.columns else None,
-        "track_temp_max": round(float(weather["TrackTemp"].max()), 1) if "TrackTemp" in weather.columns else None,
+        "track_temp_min": round(track_temp_min, 1) if track_temp_min is not None else None,
+        "track_temp_max": round(track_temp_max, 1) if track_temp_max is not None else None,
     }
 
 
 def get_pit_stop_stats(session) -> dict:
     """Extract average pit stop duration from the race."""
+    cache = _derived_cache(session)
+    if "pit_stats" in cache:
+        return cache["pit_stats"]
+
     laps = session.laps
-    pit_times = []
-    drivers = laps["Driver"].unique()
-
-    for driver in drivers:
-        driver_laps = laps[laps["Driver"] == driver].sort_values("LapNumber")
-        for _, lap in driver_laps.iterrows():
-            if pd.notna(lap.get("PitInTime")) and pd.notna(lap.get("PitOutTime")):
-                pit_duration = (lap["PitOutTime"] - lap["PitInTime"]).total_seconds()
-                if 15 < pit_duration < 60:
-                    pit_times.append(pit_duration)
-
-    if not pit_times:
-        for driver in drivers:
-            driver_laps = laps[laps["Driver"] == driver].sort_values("LapNumber")
-            for i in range(1, len(driver_laps)):
-                cur = driver_laps.iloc[i]
-                prev = driver_laps.iloc[i - 1]
-                if (
-                    pd.notna(cur.get("Stint"))
-                    and pd.notna(prev.get("Stint"))
-                    and cur["Stint"] != prev["Stint"]
-                ):
-                    if pd.notna(cur["LapTime"]) and pd.notna(prev["LapTime"]):
-                        avg_clean = laps.pick_wo_box().pick_accurate()
-                        if not avg_clean.empty:
-                            avg_time = avg_clean["LapTime"].dt.total_seconds().mean()
-                            pit_loss = cur["LapTime"].total_seconds() - avg_time
-                            if 15 < pit_loss < 40:
-                                pit_times.append(pit_loss)
-
-    if pit_times:
-        return {
+
+    # Primary path: pit lane duration from PitIn/PitOut timestamps
+    valid = laps["PitInTime"].notna() & laps["PitOutTime"].notna()
+    durations = (
+        laps.loc[valid, "PitOutTime"] - laps.loc[valid, "PitInTime"]
+    ).dt.total_seconds()
+    pit_times = durations[(durations > 15) & (durations < 60)].to_numpy()
+
+    if pit_times.size == 0:
+        # Fallback: infer pit loss from lap-time spikes at stint boundaries.
+        # Laps are sorted by (Driver, LapNumber) at ingest, so the grouped
+        # diff/shift below see rows in lap order without re-sorting.
+        ordered = laps
+        stint_changed = ordered.groupby("Driver", observed=True)["Stint"].diff().fillna(0).ne(0)
+        both_timed = ordered["LapTime"].notna() & ordered.groupby("Driver", observed=True)["LapTime"].shift().notna()
+        candidates = ordered[stint_changed & both_timed]
+        if not candidates.empty:
+            avg_clean = laps.pick_wo_box().pick_accurate()
+            if not avg_clean.empty:
+                avg_time = _lap_time_sec(avg_clean).mean()
+                pit_loss = _lap_time_sec(candidates) - avg_time
+                pit_times = pit_loss[(pit_loss > 15) & (pit_loss < 40)].to_numpy()
+
+    if pit_times.size > 0:
+        stats = {
             "avg_pit_time": float(np.mean(pit_times)),
             "min_pit_time": float(np.min(pit_times)),
             "max_pit_time": float(np.max(pit_times)),
-            "num_stops": len(pit_times),
+            "num_stops": int(pit_times.size),
         }
-    return {"avg_pit_time": 22.0, "min_pit_time": 20.0, "max_pit_time": 25.0, "num_stops": 0}
+    else:
+        stats = {"avg_pit_time": 22.0, "min_pit_time": 20.0, "max_pit_time": 25.0, "num_stops": 0}
+
+    cache["pit_stats"] = stats
+    return stats
 
 
 def get_driver_actual_strategy(session, driver: str) -> dict | None:
     """Extract what a driver actually did: stints, compounds, lap counts, total time."""
     laps = session.laps
-    driver_laps = laps[laps["Driver"] == driver].sort_values("LapNumber")
+    # Ingest sorts laps by (Driver, LapNumber), and boolean filtering
+    # preserves that order, so the driver's laps arrive already in lap order
+    driver_laps = laps[laps["Driver"] == driver]
 
     if driver_laps.empty:
         return None
 
-    stints = []
-    current_stint = None
-
-    for _, lap in driver_laps.iterrows():
-        stint_num = lap.get("Stint", 1)
-        compound = lap.get("Compound", "UNKNOWN")
-
-        if current_stint is None or current_stint["stint"] != stint_num:
-            if current_stint is not None:
-                stints.append(current_stint)
-            current_stint = {
-                "stint": int(stint_num),
-                "compound": str(compound),
-                "start_lap": int(lap["LapNumber"]),
-                "end_lap": int(lap["LapNumber"]),
-                "laps": 1,
-            }
-        else:
-            current_stint["end_lap"] = int(lap["LapNumber"])
-            current_stint["laps"] += 1
-
-    if current_stint is not None:
-        stints.append(current_stint)
-
-    lap_times = []
-    for _, lap in driver_laps.iterrows():
-        if pd.notna(lap["LapTime"]):
-            lap_times.append({
-                "lap": int(lap["LapNumber"]),
-                "time_sec": float(lap["LapTime"].total_seconds()),
-                "compound": str(lap.get("Compound", "UNKNOWN")),
-                "tyre_life": int(lap.get("TyreLife", 0)),
-            })
-
-    total_time = sum(lt["time_sec"] for lt in lap_times) if lap_times else 0
-
-    pit_laps = []
-    for i in range(len(stints) - 1):
-        pit_laps.append({
-            "lap": stints[i]["end_lap"],
-            "from_compound": stints[i]["compound"],
-            "to_compound": stints[i + 1]["compound"],
-        })
+    # Column-level dtype coercions once, then to_dict('records') — avoids
+    # per-element int()/str()/float() constructor calls
+    stint_groups = (
+        driver_laps.groupby("Stint", sort=True)
+        .agg(
+            compound=("Compound", "first"),
+            start_lap=("LapNumber", "min"),
+            end_lap=("LapNumber", "max"),
+            laps=("LapNumber", "count"),
+        )
+        .reset_index()
+        .rename(columns={"Stint": "stint"})
+        .astype({"stint": "int64", "compound": str, "start_lap": "int64", "end_lap": "int64", "laps": "int64"})
+    )
+    stints = stint_groups[["stint", "compound", "start_lap", "end_lap", "laps"]].to_dict("records")
+
+    timed = driver_laps[driver_laps["LapTime"].notna()]
+    times_sec = _lap_time_sec(timed)
+    lap_frame = pd.DataFrame({
+        "lap": timed["LapNumber"].astype("int64").to_numpy(),
+        "time_sec": times_sec.to_numpy(),
+        "compound": timed["Compound"].astype(str).to_numpy(),
+        "tyre_life": timed["TyreLife"].fillna(0).astype("int64").to_numpy(),
+    })
+    lap_times = lap_frame.to_dict("records")
+
+    total_time = float(times_sec.sum()) if lap_times else 0
+
+    pit_laps = [
+        {
+            "lap": prev["end_lap"],
+            "from_compound": prev["compound"],
+            "to_compound": nxt["compound"],
+        }
+        for prev, nxt in zip(stints[:-1], stints[1:])
+    ]
 
     return {
         "stints": stints,
@@ -336,6 +406,17 @@ def estimate_lap_time(models: dict, compound: str, tyre_life: int, race_lap: int
     return base_time
 
 
+def estimate_stint_times(
+    models: dict, compound: str, num_laps: int, start_lap: int, total_race_laps: int
+) -> np.ndarray:
+    """Vectorized estimate_lap_time over a whole stint: lap times for tyre
+    life 1..num_laps starting at race lap start_lap, fuel effect included."""
+    base_time, deg_rate = _compound_model(models, compound)
+    tyre_life = np.arange(1, num_laps + 1)
+    race_laps = np.arange(start_lap, start_lap + num_laps)
+    return base_time + deg_rate * tyre_life + (total_race_laps - race_laps) * FUEL_EFFECT_PER_LAP
+
+
 def analyze_stints(
     models: dict,
     user_stints: list[dict],
@@ -347,7 +428,12 @@ def analyze_stints(
     if not actual or not actual.get("lap_times"):
         return []
 
-    actual_by_lap = {lt["lap"]: lt for lt in actual["lap_times"]}
+    actual_laps = np.fromiter(
+        (lt["lap"] for lt in actual["lap_times"]), dtype=np.int64, count=len(actual["lap_times"])
+    )
+    actual_times = np.fromiter(
+        (lt["time_sec"] for lt in actual["lap_times"]), dtype=np.float64, count=len(actual["lap_times"])
+    )
     results = []
     current_lap = 1
 
@@ -356,25 +442,16 @@ def analyze_stints(
         num_laps = stint["laps"]
         end_lap = current_lap + num_laps - 1
 
-        # Sum user time for this stint
-        user_time = 0.0
-        for lap_in_stint in range(num_laps):
-            tyre_life = lap_in_stint + 1
-            lap_time = estimate_lap_time(models, compound, tyre_life,
-                                         race_lap=current_lap + lap_in_stint,
-                                         total_race_laps=total_race_laps)
-            is_pit = lap_in_stint == num_laps - 1 and stint_idx < len(user_stints) - 1
-            if is_pit:
-                lap_time += pit_loss
-            user_time += lap_time
-
-        # Sum actual time over same lap range
-        actual_time = 0.0
-        actual_count = 0
-        for lap in range(current_lap, end_lap + 1):
-            if lap in actual_by_lap:
-                actual_time += actual_by_lap[lap]["time_sec"]
-                actual_count += 1
+        # Sum user time for this stint — same affine model as simulate_strategy,
+        # evaluated over the whole stint at once
+        user_time = float(estimate_stint_times(models, compound, num_laps, current_lap, total_race_laps).sum())
+        if stint_idx < len(user_stints) - 1:
+            user_time += pit_loss
+
+        # Sum actual time over the same lap range
+        in_range = (actual_laps >= current_lap) & (actual_laps <= end_lap)
+        actual_count = int(in_range.sum())
+        actual_time = float(actual_times[in_range].sum())
 
         if actual_count == 0:
             current_lap = end_lap + 1
@@ -446,70 +523,130 @@ def _explain_stint(
         return f"Gained {abs_delta:.1f}s vs actual — strong stint!"
 
 
+# The search is deterministic in (models, pit_loss, total_race_laps), all of
+# which are fixed per session, so repeat simulate requests for the same race
+# hit this instead of re-running the enumeration. Bounded like the session
+# cache: least recently used entries are evicted first.
+_optimal_cache: OrderedDict = OrderedDict()
+_OPTIMAL_CACHE_SIZE = 32
+
+
 def find_optimal_strategies(
     models: dict, pit_loss: float, total_race_laps: int
 ) -> list[dict]:
     """Brute-force search for best 1-stop, 2-stop, and 3-stop strategies."""
+    cache_key = (
+        tuple(sorted((c, m["base_time"], m["deg_rate"]) for c, m in models.items())),
+        pit_loss,
+        total_race_laps,
+    )
+    cached = _optimal_cache.get(cache_key)
+    if cached is not None:
+        _optimal_cache.move_to_end(cache_key)
+        return cached
+
     compounds = ["SOFT", "MEDIUM", "HARD"]
     best = {}  # key: num_stops, value: (time, stints)
 
     n = total_race_laps
     min_stint = 5
 
+    # Precompute per-compound stint costs so each candidate strategy is scored
+    # in O(1) instead of re-simulating every lap:
+    #   sum_{j=1..L} (base + deg*j) = L*base + deg*L*(L+1)/2
+    lens = np.arange(n + 1, dtype=np.float64)
+    cost = np.empty((len(compounds), n + 1), dtype=np.float64)
+    for i, compound in enumerate(compounds):
+        base_time, deg_rate = _compound_model(models, compound)
+        cost[i] = base_time * lens + deg_rate * lens * (lens + 1) / 2.0
+
+    # Fuel burn-off adds the same total to every full-distance strategy:
+    # sum_{lap=1..n} (n - lap) * FUEL_EFFECT_PER_LAP
+    fuel_total = FUEL_EFFECT_PER_LAP * n * (n - 1) / 2.0
+
+    # Lower bounds for branch-and-bound pruning: min_cost[L] is the cheapest
+    # any compound can cover an L-lap stint (ignoring the two-compound rule,
+    # so it never overestimates), and min_lap bounds the remainder of a
+    # partially fixed strategy — degradation rates are non-negative, so an
+    # L-lap stint costs at least L times the cheapest first lap.
+    min_cost = cost.min(axis=0)
+    min_lap = float(cost[:, 1].min())
+
+    # Enumerate the valid compound combinations (≥2 distinct compounds) once
+    # per stop count; each pit-lap tuple then scores every combination in a
+    # single vectorized expression instead of a nested Python loop. The combos
+    # keep the SOFT→MEDIUM→HARD enumeration order so argmin tie-breaking
+    # matches the old loops.
+    combos = {
+        stints: np.array(
+            [c for c in itertools.product(range(len(compounds)), repeat=stints) if len(set(c)) >= 2],
+            dtype=np.intp,
+        )
+        for stints in (2, 3, 4)
+    }
+
+    def _consider(num_stops: int, pit_laps: tuple[int, ...]) -> None:
+        stint_lens = [b - a for a, b in zip((0,) + pit_laps, pit_laps + (n,))]
+        cur = best.get(num_stops)
+        if cur is not None:
+            bound = fuel_total + num_stops * pit_loss + sum(min_cost[length] for length in stint_lens)
+            if bound >= cur[0]:
+                return
+        idx = combos[num_stops + 1]
+        totals = cost[idx[:, 0], stint_lens[0]]
+        for col in range(1, idx.shape[1]):
+            totals = totals + cost[idx[:, col], stint_lens[col]]
+        i = int(np.argmin(totals))
+        total = float(totals[i]) + fuel_total + num_stops * pit_loss
+        if num_stops not in best or total < best[num_stops][0]:
+            best[num_stops] = (total, [
+                {"compound": compounds[c], "laps": length}
+                for c, length in zip(idx[i], stint_lens)
+            ])
+
     # 1-stop strategies
     for pit1 in range(min_stint, n - min_stint + 1, 2):
-        for c1 in compounds:
-            for c2 in compounds:
-                if c1 == c2:
-                    continue
-                stints = [{"compound": c1, "laps": pit1}, {"compound": c2, "laps": n - pit1}]
-                laps = simulate_strategy(models, stints, pit_loss, n)
-                total = sum(l["time_sec"] for l in laps)
-                if 1 not in best or total < best[1][0]:
-                    best[1] = (total, stints)
+        _consider(1, (pit1,))
 
     # 2-stop strategies
     for pit1 in range(min_stint, n - 2 * min_stint + 1, 3):
+        if 2 in best and min_cost[pit1] + (n - pit1) * min_lap + fuel_total + 2 * pit_loss >= best[2][0]:
+            continue
         for pit2 in range(pit1 + min_stint, n - min_stint + 1, 3):
-            for c1 in compounds:
-                for c2 in compounds:
-                    for c3 in compounds:
-                        if len({c1, c2, c3}) < 2:
-                            continue
-                        stints = [
-                            {"compound": c1, "laps": pit1},
-                            {"compound": c2, "laps": pit2 - pit1},
-                            {"compound": c3, "laps": n - pit2},
-                        ]
-                        laps = simulate_strategy(models, stints, pit_loss, n)
-                        total = sum(l["time_sec"] for l in laps)
-                        if 2 not in best or total < best[2][0]:
-                            best[2] = (total, stints)
+            _consider(2, (pit1, pit2))
 
     # 3-stop strategies
     for pit1 in range(min_stint, n - 3 * min_stint + 1, 5):
+        if 3 in best and min_cost[pit1] + (n - pit1) * min_lap + fuel_total + 3 * pit_loss >= best[3][0]:
+            continue
         for pit2 in range(pit1 + min_stint, n - 2 * min_stint + 1, 5):
+            if 3 in best and (
+                min_cost[pit1] + min_cost[pit2 - pit1] + (n - pit2) * min_lap + fuel_total + 3 * pit_loss
+                >= best[3][0]
+            ):
+                continue
             for pit3 in range(pit2 + min_stint, n - min_stint + 1, 5):
-                for c1 in compounds:
-                    for c2 in compounds:
-                        for c3 in compounds:
-                            for c4 in compounds:
-                                if len({c1, c2, c3, c4}) < 2:
-                                    continue
-                                stints = [
-                                    {"compound": c1, "laps": pit1},
-                                    {"compound": c2, "laps": pit2 - pit1},
-                                    {"compound": c3, "laps": pit3 - pit2},
-                                    {"compound": c4, "laps": n - pit3},
-                                ]
-                                laps = simulate_strategy(models, stints, pit_loss, n)
-                                total = sum(l["time_sec"] for l in laps)
-                                if 3 not in best or total < best[3][0]:
-                                    best[3] = (total, stints)
+                _consider(3, (pit1, pit2, pit3))
 
+    _optimal_cache[cache_key] = best
+    while len(_optimal_cache) > _OPTIMAL_CACHE_SIZE:
+        _optimal_cache.popitem(last=False)
     return best
 
 
+def _compound_model(models: dict, compound: str) -> tuple[float, float]:
+    """Resolve (base_time, deg_rate) for a compound, with the same fallbacks
+    as estimate_lap_time."""
+    if compound in models:
+        model = models[compound]
+        return float(model["base_time"]), float(model["deg_rate"])
+    if models:
+        avg_base = float(np.mean([m["base_time"] for m in models.values()]))
+        avg_deg = float(np.mean([m["deg_rate"] for m in models.values()]))
+        return avg_base, avg_deg
+    return 90.0, 0.0
+
+
 def simulate_strategy(models: dict, stints: list[dict], pit_loss: float, total_race_laps: int) -> list[dict]:
     """Simulate a strategy and return estimated lap times."""
     results = []
@@ -518,26 +655,27 @@ def simulate_strategy(models: dict, stints: list[dict], pit_loss: float, total_r
     for stint_idx, stint in enumerate(stints):
         compound = stint["compound"]
         num_laps = stint["laps"]
+        if num_laps <= 0:
+            continue
 
-        for lap_in_stint in range(num_laps):
-            tyre_life = lap_in_stint + 1
-            lap_time = estimate_lap_time(
-                models, compound, tyre_life, 
-                race_lap=current_lap, 
-                total_race_laps=total_race_laps
-            )
+        # Affine model over the whole stint in one shot: tire degradation
+        # plus fuel burn-off relative to end of race
+        times = estimate_stint_times(models, compound, num_laps, current_lap, total_race_laps)
 
-            is_pit_lap = lap_in_stint == num_laps - 1 and stint_idx < len(stints) - 1
-            if is_pit_lap:
-                lap_time += pit_loss
+        last_is_pit = stint_idx < len(stints) - 1
+        if last_is_pit:
+            times[-1] += pit_loss
 
-            results.append({
-                "lap": current_lap,
-                "time_sec": float(lap_time),
+        results.extend(
+            {
+                "lap": current_lap + i,
+                "time_sec": float(time_sec),
                 "compound": compound,
-                "tyre_life": tyre_life,
-                "is_pit_lap": is_pit_lap,
-            })
-            current_lap += 1
+                "tyre_life": i + 1,
+                "is_pit_lap": last_is_pit and i == num_laps - 1,
+            }
+            for i, time_sec in enumerate(times)
+        )
+        current_lap += num_laps
 
     return results
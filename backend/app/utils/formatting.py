@@ -1,17 +1,19 @@
-def format_lap_time(timedelta_obj):
-    """Convert timedelta to MM:SS.sss format."""
-    total_seconds = timedelta_obj.total_seconds()
-    minutes = int(total_seconds // 60)
-    seconds = total_seconds % 60
-    return f"{minutes}:{seconds:06.3f}"
+def format_lap_time(lap_time):
+    """Convert a lap time to MM:SS.sss format.
+
+    Accepts either a timedelta or a plain float of seconds, so bulk callers
+    can convert a whole column with .dt.total_seconds() once and format the
+    floats directly instead of paying a total_seconds() call per lap.
+    """
+    total_seconds = lap_time.total_seconds() if hasattr(lap_time, "total_seconds") else lap_time
+    minutes, seconds = divmod(total_seconds, 60)
+    return f"{int(minutes)}:{seconds:06.3f}"
 
 
 def format_race_time(total_seconds):
     """Convert total seconds to H:MM:SS.sss format."""
-    hours = int(total_seconds // 3600)
-    remaining = total_seconds % 3600
-    minutes = int(remaining // 60)
-    seconds = remaining % 60
+    hours, remaining = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(remaining, 60)
     if hours > 0:
-        return f"{hours}:{minutes:02d}:{seconds:06.3f}"
-    return f"{minutes}:{seconds:06.3f}"
+        return f"{int(hours)}:{int(minutes):02d}:{seconds:06.3f}"
+    return f"{int(minutes)}:{seconds:06.3f}"
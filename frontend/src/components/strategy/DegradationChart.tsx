@@ -119,10 +119,10 @@ export default function DegradationChart({ degradation, maxLaps = 50 }: Props) {
         .attr('stroke', compound === 'HARD' ? '#333' : 'none')
         .attr('stroke-width', 1);
 
-      // Extended trendline (extrapolated)
+      // Extended trendline (extrapolated) — straight line, two points suffice
       if (model) {
         const xMin = 1;
-        const trendPoints = d3.range(xMin, xMax + 0.5, 1).map((x) => ({
+        const trendPoints = [xMin, xMax].map((x) => ({
           x,
           y: model.base_time + model.deg_rate * x,
         }));